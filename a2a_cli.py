@@ -21,32 +21,24 @@ from a2a_sdk import A2AAgent, A2AServer
 def cmd_register(args):
     """Register an agent with the directory."""
     capabilities = args.capabilities.split(',')
-    
+
     agent = A2AAgent(
         agent_id=args.agent_id,
         name=args.name,
         capabilities=capabilities,
         directory_url=args.directory
     )
-    
-    agent.register(args.endpoint, args.directory)
+
+    agent.register(args.endpoint)
     print(f"✅ Registered {args.agent_id}")
 
 
 def cmd_discover(args):
     """Discover agents by capability."""
     capabilities = args.capabilities.split(',')
-    
-    # Use a temporary agent for discovery
-    agent = A2AAgent(
-        agent_id="cli-discover",
-        name="CLI Discover",
-        capabilities=[],
-        directory_url=args.directory
-    )
-    
-    result = agent.discover(capabilities)
-    
+
+    result = args.agent.discover(capabilities)
+
     if result:
         print(json.dumps(result, indent=2))
     else:
@@ -55,13 +47,9 @@ def cmd_discover(args):
 
 def cmd_list(args):
     """List all registered agents."""
-    import urllib.request
-    
-    url = f"{args.directory}/a2a/agents"
     try:
-        with urllib.request.urlopen(url) as response:
-            agents = json.loads(response.read().decode())
-            print(json.dumps(agents, indent=2))
+        agents = args.agent.list_all()
+        print(json.dumps({"agents": agents}, indent=2))
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -74,19 +62,59 @@ def cmd_send(args):
     except json.JSONDecodeError:
         print("Error: Invalid JSON for input", file=sys.stderr)
         sys.exit(1)
-    
-    # Use a temporary agent for sending
-    agent = A2AAgent(
-        agent_id="cli-sender",
-        name="CLI Sender",
-        capabilities=[],
-        directory_url=args.directory
-    )
-    
-    result = agent.send_task(args.target_agent, args.action, input_data)
+
+    result = args.agent.send_task(args.target_agent, args.action, input_data)
     print(json.dumps(result, indent=2))
 
 
+def cmd_repl(args):
+    """Run commands interactively over one warm agent.
+
+    Keeps a single A2AAgent (and its keep-alive connections and caches)
+    alive across commands, unlike shell loops that pay a fresh process
+    and TCP handshake per invocation.
+    """
+    agent = args.agent
+    print("A2A REPL. Commands:")
+    print("  discover <capabilities>")
+    print("  list")
+    print("  send <agent-id> <action> <input-json>")
+    print("  quit")
+
+    while True:
+        try:
+            line = input("a2a> ").strip()
+        except (EOFError, KeyboardInterrupt):
+            print()
+            break
+        if not line:
+            continue
+
+        parts = line.split(None, 3)
+        command = parts[0]
+
+        try:
+            if command in ("quit", "exit"):
+                break
+            elif command == "list":
+                print(json.dumps({"agents": agent.list_all()}, indent=2))
+            elif command == "discover" and len(parts) == 2:
+                result = agent.discover(parts[1].split(','))
+                print(json.dumps(result, indent=2) if result else "No agents found")
+            elif command == "send" and len(parts) == 4:
+                try:
+                    input_data = json.loads(parts[3])
+                except json.JSONDecodeError:
+                    print("Error: Invalid JSON for input")
+                    continue
+                result = agent.send_task(parts[1], parts[2], input_data)
+                print(json.dumps(result, indent=2))
+            else:
+                print(f"Unknown command: {line}")
+        except Exception as e:
+            print(f"Error: {e}")
+
+
 def cmd_serve(args):
     """Start an A2A agent server."""
     capabilities = args.capabilities.split(',')
@@ -163,6 +191,10 @@ Examples:
     p_send.add_argument("input_json", help="Input as JSON string")
     p_send.set_defaults(func=cmd_send)
     
+    # repl
+    p_repl = subparsers.add_parser("repl", help="Interactive command loop")
+    p_repl.set_defaults(func=cmd_repl)
+
     # serve
     p_serve = subparsers.add_parser("serve", help="Start an agent server")
     p_serve.add_argument("agent_id", help="Agent ID")
@@ -172,11 +204,20 @@ Examples:
     p_serve.set_defaults(func=cmd_serve)
     
     args = parser.parse_args()
-    
+
     if not args.command:
         parser.print_help()
         sys.exit(1)
-    
+
+    # One shared agent per invocation: its connection pool and caches
+    # are reused across the command (and across commands in repl mode).
+    args.agent = A2AAgent(
+        agent_id="cli",
+        name="CLI",
+        capabilities=[],
+        directory_url=args.directory
+    )
+
     args.func(args)
 
 
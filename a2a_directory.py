@@ -6,34 +6,125 @@ Simple HTTP server for agent registration and discovery.
 Run: python a2a_directory.py
 """
 
-import json
-import uuid
+import hashlib
+import logging
+import threading
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from http.server import BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 
-# In-memory agent registry
+# The JSON backend, body-cap reader and queue-based logging setup are
+# shared with the other servers via the SDK so they can't drift apart.
+from a2a_sdk import A2AHTTPServer, _dumps, _loads, _read_body, _setup_logging
+
+# Per-request logging goes through here, gated at WARNING by default so
+# the hot path pays no formatting or stdout lock under load. run_server
+# wires a QueueListener so emitting never blocks a handler thread on I/O.
+_LOG = logging.getLogger("a2a.directory")
+_LOG.setLevel(logging.WARNING)
+
+
+# In-memory agent registry; writes are guarded by _AGENTS_LOCK, readers
+# take cheap snapshots so discovery never blocks registration.
 AGENTS = {}
+_AGENTS_LOCK = threading.RLock()
+
+# Inverted index: capability -> set of agent ids. Kept in lockstep with
+# AGENTS so discovery is O(wanted) instead of a scan over every agent.
+CAPABILITY_INDEX = {}
+
+# Read-only snapshots of the registry and index, atomically rebound
+# after each write while the lock is held. Readers use these without
+# locking, so register-heavy load never stalls discovery or vice versa.
+_AGENTS_SNAPSHOT = {}
+_CAP_INDEX_SNAPSHOT = {}
+
+
+def _rebuild_snapshots():
+    """Rebind fresh reader snapshots (caller holds the lock)."""
+    global _AGENTS_SNAPSHOT, _CAP_INDEX_SNAPSHOT
+    _AGENTS_SNAPSHOT = dict(AGENTS)
+    _CAP_INDEX_SNAPSHOT = {
+        cap: frozenset(ids) for cap, ids in CAPABILITY_INDEX.items()
+    }
+
+
+# Per-agent serialized responses plus ETags, maintained on write, so a
+# GET /a2a/agents/<id> hit writes prebuilt bytes (or just a 304).
+_AGENT_BLOBS = {}  # agent id -> (json bytes, etag)
+
+
+def _cache_agent_blob(agent_id: str):
+    """Serialize one agent's record and ETag (caller holds the lock)."""
+    blob = _dumps(AGENTS[agent_id])
+    etag = hashlib.blake2b(blob, digest_size=8).hexdigest()
+    _AGENT_BLOBS[agent_id] = (blob, etag)
+
+# Serialized /a2a/agents response as (snapshot, payload), rebuilt lazily
+# so polling clients get a prebuilt bytes blob instead of a fresh dumps.
+# Keying the payload to the exact snapshot it was built from makes the
+# cache self-invalidating: a stale payload can never be stored over a
+# newer snapshot by a racing reader.
+_AGENTS_JSON_CACHE = None
+
+# Static error payloads, encoded once at import.
+_ERR_INVALID_JSON = _dumps({"error": "Invalid JSON"})
+_ERR_UNKNOWN_ENDPOINT = _dumps({"error": "Unknown endpoint"})
+_ERR_AGENT_NOT_FOUND = _dumps({"error": "Agent not found"})
+_ERR_BODY_TOO_LARGE = _dumps({"error": "Request body too large"})
+
+def _index_agent(agent_id: str, capabilities: list):
+    """Add an agent's capabilities to the index (caller holds the lock)."""
+    for cap in capabilities:
+        CAPABILITY_INDEX.setdefault(cap, set()).add(agent_id)
+
+
+def _unindex_agent(agent_id: str, capabilities: list):
+    """Remove an agent's capabilities from the index (caller holds the lock)."""
+    for cap in capabilities:
+        ids = CAPABILITY_INDEX.get(cap)
+        if ids is not None:
+            ids.discard(agent_id)
+            if not ids:
+                del CAPABILITY_INDEX[cap]
 
 
 class A2ADirectoryHandler(BaseHTTPRequestHandler):
     """Handle A2A directory requests."""
 
+    # Send small responses immediately instead of waiting on Nagle +
+    # delayed ACK.
+    disable_nagle_algorithm = True
+
+    # HTTP/1.1 with explicit Content-Length so client connection pools
+    # can actually reuse the socket instead of re-dialing per request.
+    protocol_version = "HTTP/1.1"
+
     def _send_json(self, status: int, data: dict):
+        self._send_json_bytes(status, _dumps(data))
+
+    def _send_json_bytes(self, status: int, payload: bytes):
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(payload)
 
     def do_POST(self):
         """Handle POST requests."""
-        content_length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(content_length).decode() if content_length > 0 else "{}"
+        body = _read_body(self)
+        if body is None:
+            # The oversized body was never drained, so the connection
+            # can't be reused for another request.
+            self.close_connection = True
+            self._send_json_bytes(413, _ERR_BODY_TOO_LARGE)
+            return
 
         try:
-            request = json.loads(body)
-        except json.JSONDecodeError:
-            self._send_json(400, {"error": "Invalid JSON"})
+            request = _loads(body or b"{}")
+        except ValueError:
+            self._send_json_bytes(400, _ERR_INVALID_JSON)
             return
 
         parsed = urlparse(self.path)
@@ -44,8 +135,11 @@ class A2ADirectoryHandler(BaseHTTPRequestHandler):
         # Discover agents
         elif parsed.path == "/a2a/discover":
             self._handle_discover(request)
+        # Deregister agent
+        elif parsed.path == "/a2a/deregister":
+            self._handle_deregister(request)
         else:
-            self._send_json(404, {"error": "Unknown endpoint"})
+            self._send_json_bytes(404, _ERR_UNKNOWN_ENDPOINT)
 
     def do_GET(self):
         """Handle GET requests."""
@@ -59,7 +153,7 @@ class A2ADirectoryHandler(BaseHTTPRequestHandler):
             agent_id = parsed.path.split("/")[-1]
             self._handle_get_agent(agent_id)
         else:
-            self._send_json(404, {"error": "Unknown endpoint"})
+            self._send_json_bytes(404, _ERR_UNKNOWN_ENDPOINT)
 
     def _handle_register(self, request: dict):
         """Register an agent."""
@@ -71,13 +165,20 @@ class A2ADirectoryHandler(BaseHTTPRequestHandler):
             return
 
         agent_id = request["agentId"]
-        AGENTS[agent_id] = {
-            "agentId": agent_id,
-            "name": request["name"],
-            "capabilities": request["capabilities"],
-            "endpoint": request["endpoint"],
-            "registeredAt": datetime.utcnow().isoformat() + "Z"
-        }
+        with _AGENTS_LOCK:
+            previous = AGENTS.get(agent_id)
+            if previous:
+                _unindex_agent(agent_id, previous["capabilities"])
+            _index_agent(agent_id, request["capabilities"])
+            AGENTS[agent_id] = {
+                "agentId": agent_id,
+                "name": request["name"],
+                "capabilities": request["capabilities"],
+                "endpoint": request["endpoint"],
+                "registeredAt": datetime.utcnow().isoformat() + "Z"
+            }
+            _cache_agent_blob(agent_id)
+            _rebuild_snapshots()
 
         print(f"📋 Registered agent: {agent_id} ({request['name']})")
         self._send_json(200, {
@@ -85,6 +186,30 @@ class A2ADirectoryHandler(BaseHTTPRequestHandler):
             "agentId": agent_id
         })
 
+    def _handle_deregister(self, request: dict):
+        """Deregister an agent."""
+        agent_id = request.get("agentId")
+        if not agent_id:
+            self._send_json(400, {"error": "Missing fields: ['agentId']"})
+            return
+
+        with _AGENTS_LOCK:
+            agent = AGENTS.pop(agent_id, None)
+            if agent:
+                _unindex_agent(agent_id, agent["capabilities"])
+                _AGENT_BLOBS.pop(agent_id, None)
+                _rebuild_snapshots()
+
+        if agent is None:
+            self._send_json_bytes(404, _ERR_AGENT_NOT_FOUND)
+            return
+
+        print(f"📋 Deregistered agent: {agent_id}")
+        self._send_json(200, {
+            "status": "deregistered",
+            "agentId": agent_id
+        })
+
     def _handle_discover(self, request: dict):
         """Discover agents by capabilities."""
         wanted = request.get("capabilities", [])
@@ -93,38 +218,70 @@ class A2ADirectoryHandler(BaseHTTPRequestHandler):
             self._send_json(400, {"error": "No capabilities specified"})
             return
 
-        matches = []
-        for agent_id, agent in AGENTS.items():
-            agent_caps = set(agent["capabilities"])
-            # Check if any of the wanted capabilities match
-            if any(cap in agent_caps for cap in wanted):
-                matches.append(agent)
+        # Lock-free: read one generation of the snapshots. An id from a
+        # slightly older index generation may be gone from the newer
+        # agents snapshot, hence the membership check.
+        index = _CAP_INDEX_SNAPSHOT
+        agents = _AGENTS_SNAPSHOT
+        hits = set().union(*(index.get(cap, ()) for cap in wanted))
+        matches = [agents[agent_id] for agent_id in hits if agent_id in agents]
 
-        print(f"🔍 Discovery: wanted {wanted}, found {len(matches)} agents")
+        if _LOG.isEnabledFor(logging.INFO):
+            _LOG.info("🔍 Discovery: wanted %s, found %d agents", wanted, len(matches))
         self._send_json(200, {"agents": matches})
 
     def _handle_list_agents(self):
         """List all registered agents."""
-        self._send_json(200, {"agents": list(AGENTS.values())})
+        global _AGENTS_JSON_CACHE
+        # Pin one snapshot generation, serve the cached payload only if
+        # it was built from that exact generation, and store the pair
+        # atomically. A reader racing a registry write can at worst
+        # cache a payload tagged with its own (older) snapshot, which
+        # the next request ignores — never a stale blob served forever.
+        snapshot = _AGENTS_SNAPSHOT
+        cached = _AGENTS_JSON_CACHE
+        if cached is not None and cached[0] is snapshot:
+            payload = cached[1]
+        else:
+            payload = _dumps({"agents": list(snapshot.values())})
+            _AGENTS_JSON_CACHE = (snapshot, payload)
+        self._send_json_bytes(200, payload)
 
     def _handle_get_agent(self, agent_id: str):
         """Get specific agent info."""
-        if agent_id in AGENTS:
-            self._send_json(200, AGENTS[agent_id])
-        else:
-            self._send_json(404, {"error": "Agent not found"})
+        entry = _AGENT_BLOBS.get(agent_id)
+        if entry is None:
+            self._send_json_bytes(404, _ERR_AGENT_NOT_FOUND)
+            return
+
+        blob, etag = entry
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(blob)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(blob)
 
     def log_message(self, format, *args):
-        """Custom log format."""
-        print(f"[{self.log_date_time_string()}] {format % args}")
+        """Per-request access log, gated so formatting is skipped at WARNING."""
+        if _LOG.isEnabledFor(logging.INFO):
+            _LOG.info("[%s] " + format, self.log_date_time_string(), *args)
 
 
-def run_server(port: int = 8080):
+def run_server(port: int = 8080, log_level: int = logging.WARNING):
     """Start the A2A directory server."""
-    server = HTTPServer(("0.0.0.0", port), A2ADirectoryHandler)
+    _setup_logging(_LOG, log_level)
+    server = A2AHTTPServer(("0.0.0.0", port), A2ADirectoryHandler)
     print(f"🚀 A2A Directory Service running on http://localhost:{port}")
     print(f"   Endpoints:")
     print(f"   POST /a2a/register   - Register an agent")
+    print(f"   POST /a2a/deregister - Deregister an agent")
     print(f"   POST /a2a/discover  - Discover agents by capability")
     print(f"   GET  /a2a/agents    - List all agents")
     print()
@@ -20,34 +20,267 @@ Usage:
     result = agent.send_task(other["agentId"], "do something", {"input": "..."})
 """
 
+import asyncio
+import contextlib
+import http.client
+import itertools
 import json
+import logging
+import logging.handlers
+import queue
+import random
+import socket
+import sys
+import threading
+import time
 import uuid
-import urllib.request
-import urllib.error
+from http.server import ThreadingHTTPServer
 from typing import Optional, Callable
+from urllib.parse import urlsplit
+
+try:  # optional C-accelerated JSON; serializes straight to bytes
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    _loads = json.loads
+
+def _setup_logging(logger: logging.Logger, level: int = logging.WARNING) -> logging.handlers.QueueListener:
+    """Route a logger's records through a queue to a dedicated thread.
+
+    Shared by the directory and bridge servers: emitting never blocks a
+    handler thread on stream I/O, the QueueListener thread does the
+    formatting and writing.
+    """
+    log_queue = queue.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    listener.start()
+    return listener
+
+
+# Keep-alive connections, cached per (scheme, host:port) per thread so
+# repeated calls to the same server skip the TCP handshake. Connections
+# idle longer than _CONN_IDLE_MAX are re-dialed since the server has
+# likely dropped them.
+_CONN_IDLE_MAX = 30.0
+_local = threading.local()
+
+_JSON_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "Connection": "keep-alive",
+}
+
+# Long-running agents discover the same handful of capability sets over
+# and over, so the request bodies are serialized once per distinct query
+# and the strings interned, making later cache-key comparisons pointer
+# compares instead of fresh sorts, dumps and string equality checks.
+_CAP_CACHE = {}  # capability tuple -> serialized discover body
+
+
+def _cap_key(capabilities) -> tuple:
+    """Canonical interned tuple key for a capability query."""
+    if isinstance(capabilities, tuple) and capabilities in _CAP_CACHE:
+        return capabilities
+    return tuple(sorted(sys.intern(c) for c in capabilities))
+
+
+def _discover_body(key: tuple) -> bytes:
+    """Serialized discover payload for a capability key, built once."""
+    body = _CAP_CACHE.get(key)
+    if body is None:
+        body = _CAP_CACHE.setdefault(key, _dumps({"capabilities": list(key)}))
+    return body
+
+
+# Pool limits for the asyncio client: concurrent requests each get
+# their own socket (so a burst never serializes behind one connection's
+# head-of-line), but only _MAX_KEEPALIVE idle sockets are kept per host
+# and at most _MAX_CONNECTIONS requests are in flight per agent.
+_MAX_KEEPALIVE = 8
+_MAX_CONNECTIONS = 32
+
+# Deadline for one connect and for one request/response exchange on the
+# asyncio client, matching the sync pool's 10s connection timeout, so a
+# hung server fails the call instead of blocking a gather forever.
+_ASYNC_TIMEOUT = 10.0
+
+# Request head for the asyncio client, encoded once; per request only
+# method, path, host and body length are substituted in.
+_HTTP_HEAD_TEMPLATE = (
+    b"%s %s HTTP/1.1\r\n"
+    b"Host: %s\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Accept: application/json\r\n"
+    b"Connection: keep-alive\r\n"
+    b"Content-Length: %d\r\n\r\n"
+)
+
+# Cap inbound request bodies and read them in chunks so one client
+# can't make a server buffer an arbitrarily large payload at once.
+_MAX_BODY = 1 << 20
+_BODY_CHUNK = 64 * 1024
+
+
+class A2AHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer tuned for small JSON-RPC messages.
+
+    Binds with SO_REUSEPORT where the platform supports it, so multiple
+    server processes can share a port and let the kernel balance
+    accepts. Handlers should also set disable_nagle_algorithm so
+    one-packet responses are not held back by Nagle + delayed ACK.
+    """
+
+    def server_bind(self):
+        if hasattr(socket, "SO_REUSEPORT"):
+            with contextlib.suppress(OSError):
+                self.socket.setsockopt(
+                    socket.SOL_SOCKET, socket.SO_REUSEPORT, 1
+                )
+        super().server_bind()
+
+
+# Largest number of tasks accepted in one a2a/tasks batch.
+_MAX_BATCH = 64
+
+# JSON-RPC envelope templates: the constant scaffold is encoded once and
+# only the variable parts are serialized per message.
+_TASK_TEMPLATE = b'{"jsonrpc":"2.0","method":"a2a/task","id":"%s","params":%s}'
+_RESULT_TEMPLATE = b'{"jsonrpc":"2.0","id":%s,"result":%s}'
+_ERROR_TEMPLATE = b'{"jsonrpc":"2.0","id":%s,"error":%s}'
+
+# Common error objects, serialized once at import.
+_ERR_NO_HANDLER = _dumps({"code": -32001, "message": "No handler registered"})
+_ERR_METHOD_NOT_FOUND = _dumps({"code": -32601, "message": "Method not found"})
+
+
+def _read_body(handler) -> Optional[bytes]:
+    """Read a POST body in bounded chunks; None if it exceeds _MAX_BODY."""
+    try:
+        remaining = int(handler.headers.get("Content-Length", 0))
+    except ValueError:
+        return None
+    if remaining > _MAX_BODY:
+        return None
+    buf = bytearray()
+    while remaining > 0:
+        chunk = handler.rfile.read(min(remaining, _BODY_CHUNK))
+        if not chunk:
+            break
+        buf += chunk
+        remaining -= len(chunk)
+    return bytes(buf)
+
+
+def _connection_for(scheme: str, netloc: str) -> http.client.HTTPConnection:
+    """Get (or dial) the cached keep-alive connection for a host."""
+    cache = getattr(_local, "connections", None)
+    if cache is None:
+        cache = _local.connections = {}
+    key = (scheme, netloc)
+    entry = cache.get(key)
+    if entry is not None:
+        conn, last_used = entry
+        if time.monotonic() - last_used < _CONN_IDLE_MAX:
+            return conn
+        conn.close()
+    conn_cls = (
+        http.client.HTTPSConnection if scheme == "https"
+        else http.client.HTTPConnection
+    )
+    conn = conn_cls(netloc, timeout=10)
+    cache[key] = (conn, time.monotonic())
+    return conn
+
+
+def _drop_connection(scheme: str, netloc: str):
+    """Discard a broken cached connection so the next call re-dials."""
+    cache = getattr(_local, "connections", {})
+    entry = cache.pop((scheme, netloc), None)
+    if entry is not None:
+        entry[0].close()
+
+
+def _close_connections():
+    """Close every keep-alive connection cached by this thread."""
+    cache = getattr(_local, "connections", None)
+    if cache:
+        for conn, _ in cache.values():
+            conn.close()
+        cache.clear()
+
+
+# Retry policy for transient failures: up to _RETRY_TOTAL attempts on
+# connection errors and 502/503/504 responses, sleeping
+# _RETRY_BACKOFF * 2**n plus jitter between attempts so synchronized
+# clients don't re-hit a recovering server in lockstep. A Retry-After
+# header, when present, overrides the computed backoff.
+_RETRY_TOTAL = 3
+_RETRY_BACKOFF = 0.2
+_RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+def _retry_sleep(attempt: int, retry_after: Optional[str] = None):
+    """Sleep before retry attempt ``attempt`` (0-based), with jitter."""
+    delay = _RETRY_BACKOFF * (2 ** attempt)
+    if retry_after:
+        with contextlib.suppress(ValueError):
+            delay = max(delay, float(retry_after))
+    time.sleep(delay * (0.5 + random.random()))
+
+
+def _request(method: str, url: str, body: Optional[bytes] = None) -> dict:
+    """Make an HTTP request over a pooled keep-alive connection."""
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    for attempt in range(_RETRY_TOTAL):
+        last = attempt == _RETRY_TOTAL - 1
+        conn = _connection_for(parts.scheme, parts.netloc)
+        try:
+            conn.request(method, path, body=body, headers=_JSON_HEADERS)
+            response = conn.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            # Drop the (possibly stale or poisoned) pooled socket so the
+            # retry dials fresh rather than re-failing on it.
+            _drop_connection(parts.scheme, parts.netloc)
+            if last:
+                raise
+            # A reused socket often just went stale; retry immediately
+            # the first time and back off only after a fresh dial fails.
+            if attempt:
+                _retry_sleep(attempt)
+            continue
+        cache = _local.connections
+        cache[(parts.scheme, parts.netloc)] = (conn, time.monotonic())
+        if response.status in _RETRY_STATUSES and not last:
+            _retry_sleep(attempt, response.getheader("Retry-After"))
+            continue
+        if response.status >= 400:
+            error = {"error": f"HTTP {response.status}"}
+            if method == "POST":
+                error["message"] = data.decode()
+            return error
+        return _loads(data)
 
 
 def _post(url: str, data: dict) -> dict:
     """Make POST request."""
-    req = urllib.request.Request(
-        url,
-        data=json.dumps(data).encode(),
-        headers={"Content-Type": "application/json"}
-    )
-    try:
-        with urllib.request.urlopen(req) as response:
-            return json.loads(response.read().decode())
-    except urllib.error.HTTPError as e:
-        return {"error": f"HTTP {e.code}", "message": e.read().decode()}
+    return _request("POST", url, body=_dumps(data))
 
 
 def _get(url: str) -> dict:
     """Make GET request."""
-    try:
-        with urllib.request.urlopen(url) as response:
-            return json.loads(response.read().decode())
-    except urllib.error.HTTPError as e:
-        return {"error": f"HTTP {e.code}"}
+    return _request("GET", url)
 
 
 class A2AAgent:
@@ -58,13 +291,43 @@ class A2AAgent:
         agent_id: str,
         name: str,
         capabilities: list,
-        directory_url: str = "http://localhost:8080"
+        directory_url: str = "http://localhost:8080",
+        discover_ttl: float = 60.0
     ):
         self.agent_id = agent_id
         self.name = name
         self.capabilities = capabilities
         self.directory_url = directory_url.rstrip("/")
         self.endpoint = None
+        # Task ids are a random per-instance prefix plus a counter, so
+        # each send_task skips a uuid4 (urandom read + formatting).
+        # itertools.count() is atomic in CPython, so no lock is needed.
+        self._id_prefix = f"{agent_id}-{uuid.uuid4().hex[:8]}-"
+        self._id_counter = itertools.count()
+        # Resolved target endpoints, cached with a TTL: endpoints change
+        # rarely, so most send_task calls skip the directory round trip.
+        self.endpoint_ttl = 60.0
+        self._endpoint_cache = {}  # agent id -> (endpoint, fetched-at)
+        # Discovery results, cached per sorted capability tuple: the
+        # same queries repeat constantly in agent loops and the
+        # registry changes rarely.
+        self.discover_ttl = discover_ttl
+        self._discover_cache = {}  # capability tuple -> (fetched-at, agent)
+
+    def close(self):
+        """Release this thread's pooled keep-alive connections.
+
+        Call when the agent is done sending (or use the agent as a
+        context manager) so sockets don't linger in TIME_WAIT-prone
+        half-open states on long-lived processes.
+        """
+        _close_connections()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def register(self, endpoint: str):
         """Register this agent with the directory."""
@@ -83,42 +346,496 @@ class A2AAgent:
         print(f"✅ Registered: {self.agent_id}")
         return result
 
+    def list_all(self) -> list:
+        """List every agent registered with the directory."""
+        result = _get(f"{self.directory_url}/a2a/agents")
+        if "error" in result:
+            raise RuntimeError(f"Listing failed: {result}")
+        return result.get("agents", [])
+
     def discover(self, wanted_capabilities: list) -> Optional[dict]:
-        """Discover agents with specified capabilities."""
-        result = _post(
+        """Discover agents with specified capabilities.
+
+        Hits within discover_ttl seconds are served from a local cache
+        without touching the directory; misses (no agent found) are not
+        cached so a just-registered agent is seen immediately.
+        """
+        key = _cap_key(wanted_capabilities)
+        cached = self._discover_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.discover_ttl:
+            return cached[1]
+
+        result = _request(
+            "POST",
             f"{self.directory_url}/a2a/discover",
-            {"capabilities": wanted_capabilities}
+            body=_discover_body(key)
         )
         agents = result.get("agents", [])
         if not agents:
             return None
+        self._discover_cache[key] = (time.monotonic(), agents[0])
         return agents[0]
 
-    def send_task(self, target_agent_id: str, action: str, input_data: dict) -> dict:
-        """Send a task to another agent."""
-        task_id = str(uuid.uuid4())
-        
-        # Get target agent's endpoint
+    def discover_many(self, caps_list: list) -> dict:
+        """Warm discovery for several capability queries up front.
+
+        Results land in the discover cache, so later discover() calls
+        for the same capabilities are free. Returns
+        {tuple(sorted(caps)): agent}, with misses omitted.
+        """
+        return {
+            _cap_key(caps): agent
+            for caps in caps_list
+            if (agent := self.discover(caps)) is not None
+        }
+
+    def invalidate_discovery(self, capabilities: Optional[list] = None):
+        """Drop cached discovery results (for one query, or all)."""
+        if capabilities is None:
+            self._discover_cache.clear()
+        else:
+            self._discover_cache.pop(_cap_key(capabilities), None)
+
+    def _resolve_endpoint(self, target_agent_id: str, refresh: bool = False) -> str:
+        """Resolve a target agent's endpoint, caching it for endpoint_ttl."""
+        if not refresh:
+            cached = self._endpoint_cache.get(target_agent_id)
+            if cached and time.monotonic() - cached[1] < self.endpoint_ttl:
+                return cached[0]
+
         target = _get(f"{self.directory_url}/a2a/agents/{target_agent_id}")
         if "error" in target:
+            self._endpoint_cache.pop(target_agent_id, None)
             raise ValueError(f"Agent not found: {target_agent_id}")
-        
-        target_endpoint = target["endpoint"]
-        
-        # Send task to target agent
-        task_request = {
+
+        endpoint = target["endpoint"]
+        self._endpoint_cache[target_agent_id] = (endpoint, time.monotonic())
+        return endpoint
+
+    def send_task(self, target_agent_id: str, action: str, input_data: dict) -> dict:
+        """Send a task to another agent."""
+        task_id = self._id_prefix + format(next(self._id_counter), "x")
+
+        # Get target agent's endpoint (cached between sends)
+        target_endpoint = self._resolve_endpoint(target_agent_id)
+
+        # Send task to target agent; only the variable parts are
+        # serialized, the envelope scaffold is a prebuilt template.
+        params = {
+            "taskId": task_id,
+            "action": action,
+            "sender": self.agent_id,
+            "input": input_data
+        }
+        body = _TASK_TEMPLATE % (task_id.encode(), _dumps(params))
+        result = _request("POST", target_endpoint, body=body)
+
+        # A 404 usually means the cached endpoint went stale (agent
+        # moved or restarted): re-resolve once and retry.
+        if result.get("error") == "HTTP 404":
+            target_endpoint = self._resolve_endpoint(target_agent_id, refresh=True)
+            result = _request("POST", target_endpoint, body=body)
+        return result
+
+    def bind_sender(self, target_agent_id: str) -> Callable:
+        """Return a send function specialized for one target agent.
+
+        The endpoint is resolved once and captured in the closure along
+        with the constant envelope fields, so a loop sending many tasks
+        to the same agent skips the per-call endpoint-cache lookup and
+        attribute chasing. The closure keeps send_task's stale-endpoint
+        retry, re-resolving on a 404.
+        """
+        endpoint = self._resolve_endpoint(target_agent_id)
+        agent_id = self.agent_id
+        prefix = self._id_prefix
+        counter = self._id_counter
+
+        def _send(action: str, input_data: dict) -> dict:
+            nonlocal endpoint
+            task_id = prefix + format(next(counter), "x")
+            body = _TASK_TEMPLATE % (task_id.encode(), _dumps({
+                "taskId": task_id,
+                "action": action,
+                "sender": agent_id,
+                "input": input_data
+            }))
+            result = _request("POST", endpoint, body=body)
+            if result.get("error") == "HTTP 404":
+                endpoint = self._resolve_endpoint(target_agent_id, refresh=True)
+                result = _request("POST", endpoint, body=body)
+            return result
+
+        return _send
+
+    def send_tasks(self, target_agent_id: str, tasks: list) -> list:
+        """Send several tasks to one agent in a single round trip.
+
+        Each task is a dict with "action" and optional "input_data".
+        Batches above the server cap are split into multiple requests,
+        and targets that don't speak the batch method get one plain
+        send_task per task, so the result list always lines up with
+        the input.
+        """
+        if len(tasks) > _MAX_BATCH:
+            results = []
+            for start in range(0, len(tasks), _MAX_BATCH):
+                results.extend(
+                    self.send_tasks(target_agent_id, tasks[start:start + _MAX_BATCH])
+                )
+            return results
+
+        batch_id = self._id_prefix + format(next(self._id_counter), "x")
+        target_endpoint = self._resolve_endpoint(target_agent_id)
+
+        result = _post(target_endpoint, {
             "jsonrpc": "2.0",
-            "id": task_id,
-            "method": "a2a/task",
+            "id": batch_id,
+            "method": "a2a/tasks",
             "params": {
+                "sender": self.agent_id,
+                "tasks": [
+                    {
+                        "taskId": f"{batch_id}-{i}",
+                        "action": task["action"],
+                        "input": task.get("input_data", {})
+                    }
+                    for i, task in enumerate(tasks)
+                ]
+            }
+        })
+
+        error = result.get("error")
+        if error is not None:
+            # Older agents without the batch method: send one by one.
+            if (isinstance(error, dict) and error.get("code") == -32601) \
+                    or error in ("HTTP 400", "HTTP 404", "HTTP 413"):
+                return [
+                    self.send_task(
+                        target_agent_id, task["action"], task.get("input_data", {})
+                    )
+                    for task in tasks
+                ]
+            return [result] * len(tasks)
+
+        return result.get("result", [])
+
+
+class AsyncA2AAgent:
+    """Asyncio variant of A2AAgent.
+
+    Speaks the same directory and task protocol, but discover() and
+    send_task() are coroutines, so independent calls can overlap under
+    asyncio.gather instead of serializing their network waits.
+    Keep-alive connections are pooled per host and reused across calls;
+    use the agent as an async context manager (or call close()) to
+    release them.
+    """
+
+    def __init__(
+        self,
+        agent_id: str,
+        name: str,
+        capabilities: list,
+        directory_url: str = "http://localhost:8080",
+        discover_ttl: float = 60.0
+    ):
+        self.agent_id = agent_id
+        self.name = name
+        self.capabilities = capabilities
+        self.directory_url = directory_url.rstrip("/")
+        self.endpoint = None
+        self._id_prefix = f"{agent_id}-{uuid.uuid4().hex[:8]}-"
+        self._id_counter = itertools.count()
+        self.endpoint_ttl = 60.0
+        self._endpoint_cache = {}  # agent id -> (endpoint, fetched-at)
+        self.discover_ttl = discover_ttl
+        self._discover_cache = {}  # capability tuple -> (fetched-at, agent)
+        self._idle = {}  # netloc -> list of idle (reader, writer) pairs
+        # Created lazily inside the running loop: on Python < 3.10
+        # asyncio primitives bind the event loop at construction, and
+        # agents are routinely built before asyncio.run() starts one.
+        self._conn_sem = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close every pooled keep-alive connection."""
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+                with contextlib.suppress(Exception):
+                    await writer.wait_closed()
+        self._idle.clear()
+
+    async def _request(self, method: str, url: str, body: Optional[bytes] = None) -> dict:
+        """Make one HTTP request, reusing a pooled connection if idle."""
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        host, _, port = parts.netloc.partition(":")
+        port = int(port or (443 if parts.scheme == "https" else 80))
+        use_ssl = parts.scheme == "https"
+
+        if self._conn_sem is None:
+            self._conn_sem = asyncio.Semaphore(_MAX_CONNECTIONS)
+
+        # One retry: a kept-alive socket may have gone stale.
+        async with self._conn_sem:
+            return await self._request_connected(
+                method, parts, path, host, port, use_ssl, body
+            )
+
+    async def _request_connected(self, method, parts, path, host, port, use_ssl, body):
+        for attempt in (0, 1):
+            idle = self._idle.setdefault(parts.netloc, [])
+            writer = None
+            try:
+                if idle:
+                    reader, writer = idle.pop()
+                else:
+                    reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection(host, port, ssl=use_ssl),
+                        _ASYNC_TIMEOUT,
+                    )
+                status_line, headers, status, data = await asyncio.wait_for(
+                    self._exchange(reader, writer, method, parts, path, body),
+                    _ASYNC_TIMEOUT,
+                )
+            except (OSError, ValueError, asyncio.IncompleteReadError,
+                    asyncio.TimeoutError):
+                if writer is not None:
+                    writer.close()
+                if attempt:
+                    raise
+                continue
+
+            if headers.get("connection", "").lower() == "close" or \
+                    status_line.startswith(b"HTTP/1.0") or \
+                    len(idle) >= _MAX_KEEPALIVE:
+                writer.close()
+            else:
+                idle.append((reader, writer))
+
+            if status >= 400:
+                error = {"error": f"HTTP {status}"}
+                if method == "POST":
+                    error["message"] = data.decode()
+                return error
+            return _loads(data)
+
+    @staticmethod
+    async def _exchange(reader, writer, method, parts, path, body):
+        """Write one request and read its response on an open socket."""
+        writer.write(_HTTP_HEAD_TEMPLATE % (
+            method.encode(),
+            path.encode(),
+            parts.netloc.encode(),
+            len(body) if body else 0,
+        ) + (body or b""))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by peer")
+        status = int(status_line.split(None, 2)[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = headers.get("content-length")
+        if status in (204, 304):
+            data = b""
+        elif length is not None:
+            data = await reader.readexactly(int(length))
+        else:
+            # HTTP/1.0-style response: body runs to connection close,
+            # so the socket can't be reused.
+            data = await reader.read()
+            headers["connection"] = "close"
+        return status_line, headers, status, data
+
+    async def register(self, endpoint: str):
+        """Register this agent with the directory."""
+        self.endpoint = endpoint
+        result = await self._request(
+            "POST",
+            f"{self.directory_url}/a2a/register",
+            body=_dumps({
+                "agentId": self.agent_id,
+                "name": self.name,
+                "capabilities": self.capabilities,
+                "endpoint": endpoint
+            })
+        )
+        if "error" in result:
+            raise RuntimeError(f"Registration failed: {result}")
+        print(f"✅ Registered: {self.agent_id}")
+        return result
+
+    async def discover(self, wanted_capabilities: list) -> Optional[dict]:
+        """Discover agents with specified capabilities (TTL-cached)."""
+        key = _cap_key(wanted_capabilities)
+        cached = self._discover_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.discover_ttl:
+            return cached[1]
+
+        result = await self._request(
+            "POST",
+            f"{self.directory_url}/a2a/discover",
+            body=_discover_body(key)
+        )
+        agents = result.get("agents", [])
+        if not agents:
+            return None
+        self._discover_cache[key] = (time.monotonic(), agents[0])
+        return agents[0]
+
+    async def discover_many(self, caps_list: list) -> dict:
+        """Warm discovery for several capability queries at once.
+
+        The lookups run concurrently, so N queries cost about one round
+        trip of wall clock instead of N. Results land in the discover
+        cache, so later discover() calls for the same capabilities are
+        free. Returns {tuple(sorted(caps)): agent}, with misses omitted.
+        """
+        results = await asyncio.gather(
+            *(self.discover(caps) for caps in caps_list)
+        )
+        return {
+            _cap_key(caps): agent
+            for caps, agent in zip(caps_list, results)
+            if agent is not None
+        }
+
+    def invalidate_discovery(self, capabilities: Optional[list] = None):
+        """Drop cached discovery results (for one query, or all)."""
+        if capabilities is None:
+            self._discover_cache.clear()
+        else:
+            self._discover_cache.pop(_cap_key(capabilities), None)
+
+    async def _resolve_endpoint(self, target_agent_id: str, refresh: bool = False) -> str:
+        """Resolve a target agent's endpoint, caching it for endpoint_ttl."""
+        if not refresh:
+            cached = self._endpoint_cache.get(target_agent_id)
+            if cached and time.monotonic() - cached[1] < self.endpoint_ttl:
+                return cached[0]
+
+        target = await self._request(
+            "GET", f"{self.directory_url}/a2a/agents/{target_agent_id}"
+        )
+        if "error" in target:
+            self._endpoint_cache.pop(target_agent_id, None)
+            raise ValueError(f"Agent not found: {target_agent_id}")
+
+        endpoint = target["endpoint"]
+        self._endpoint_cache[target_agent_id] = (endpoint, time.monotonic())
+        return endpoint
+
+    async def send_task(self, target_agent_id: str, action: str, input_data: dict) -> dict:
+        """Send a task to another agent."""
+        task_id = self._id_prefix + format(next(self._id_counter), "x")
+        target_endpoint = await self._resolve_endpoint(target_agent_id)
+
+        params = {
+            "taskId": task_id,
+            "action": action,
+            "sender": self.agent_id,
+            "input": input_data
+        }
+        body = _TASK_TEMPLATE % (task_id.encode(), _dumps(params))
+        result = await self._request("POST", target_endpoint, body=body)
+
+        if result.get("error") == "HTTP 404":
+            target_endpoint = await self._resolve_endpoint(
+                target_agent_id, refresh=True
+            )
+            result = await self._request("POST", target_endpoint, body=body)
+        return result
+
+    async def bind_sender(self, target_agent_id: str) -> Callable:
+        """Return a send coroutine specialized for one target agent.
+
+        Async counterpart of A2AAgent.bind_sender: the endpoint is
+        resolved once up front and captured in the closure, which keeps
+        the stale-endpoint retry on a 404.
+        """
+        endpoint = await self._resolve_endpoint(target_agent_id)
+        agent_id = self.agent_id
+        prefix = self._id_prefix
+        counter = self._id_counter
+
+        async def _send(action: str, input_data: dict) -> dict:
+            nonlocal endpoint
+            task_id = prefix + format(next(counter), "x")
+            body = _TASK_TEMPLATE % (task_id.encode(), _dumps({
                 "taskId": task_id,
                 "action": action,
-                "sender": self.agent_id,
+                "sender": agent_id,
                 "input": input_data
+            }))
+            result = await self._request("POST", endpoint, body=body)
+            if result.get("error") == "HTTP 404":
+                endpoint = await self._resolve_endpoint(
+                    target_agent_id, refresh=True
+                )
+                result = await self._request("POST", endpoint, body=body)
+            return result
+
+        return _send
+
+    async def send_tasks(self, target_agent_id: str, tasks: list) -> list:
+        """Send several tasks to one agent in a single round trip."""
+        if len(tasks) > _MAX_BATCH:
+            results = []
+            for start in range(0, len(tasks), _MAX_BATCH):
+                results.extend(await self.send_tasks(
+                    target_agent_id, tasks[start:start + _MAX_BATCH]
+                ))
+            return results
+
+        batch_id = self._id_prefix + format(next(self._id_counter), "x")
+        target_endpoint = await self._resolve_endpoint(target_agent_id)
+
+        result = await self._request("POST", target_endpoint, body=_dumps({
+            "jsonrpc": "2.0",
+            "id": batch_id,
+            "method": "a2a/tasks",
+            "params": {
+                "sender": self.agent_id,
+                "tasks": [
+                    {
+                        "taskId": f"{batch_id}-{i}",
+                        "action": task["action"],
+                        "input": task.get("input_data", {})
+                    }
+                    for i, task in enumerate(tasks)
+                ]
             }
-        }
-        
-        return _post(target_endpoint, task_request)
+        }))
+
+        error = result.get("error")
+        if error is not None:
+            if (isinstance(error, dict) and error.get("code") == -32601) \
+                    or error in ("HTTP 400", "HTTP 404", "HTTP 413"):
+                return [
+                    await self.send_task(
+                        target_agent_id, task["action"], task.get("input_data", {})
+                    )
+                    for task in tasks
+                ]
+            return [result] * len(tasks)
+
+        return result.get("result", [])
 
 
 class A2AServer:
@@ -139,25 +856,53 @@ class A2AServer:
 
     def run(self):
         """Run the agent server."""
-        from http.server import HTTPServer, BaseHTTPRequestHandler
-        
+        from http.server import BaseHTTPRequestHandler
+
         task_handler = self._task_handler  # Capture for closure
-        
+
         class Handler(BaseHTTPRequestHandler):
+            # Send small responses immediately instead of waiting on
+            # Nagle + delayed ACK.
+            disable_nagle_algorithm = True
+
+            # HTTP/1.1 with explicit Content-Length so client
+            # connection pools can reuse the socket across tasks.
+            protocol_version = "HTTP/1.1"
+
+            def _send_payload(self, status, payload):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
             def do_POST(self):
-                content_length = int(self.headers.get("Content-Length", 0))
-                body = self.rfile.read(content_length).decode()
-                request = json.loads(body)
+                body = _read_body(self)
+                if body is None:
+                    # The oversized body was never drained, so the
+                    # connection can't be reused for another request.
+                    self.close_connection = True
+                    self._send_payload(
+                        413, _dumps({"error": "Request body too large"})
+                    )
+                    return
+                try:
+                    request = _loads(body or b"{}")
+                except ValueError:
+                    self._send_payload(400, _dumps({"error": "Invalid JSON"}))
+                    return
                 
                 jsonrpc_method = request.get("method", "")
                 task_id = request.get("id")
                 
+                task_id_json = _dumps(task_id)
+
                 if jsonrpc_method == "a2a/task":
                     params = request.get("params", {})
                     task_action = params.get("action")
                     input_data = params.get("input", {})
                     sender = params.get("sender")
-                    
+
                     # Call task handler
                     if task_handler:
                         result = task_handler(
@@ -165,51 +910,180 @@ class A2AServer:
                             input_data=input_data,
                             sender=sender
                         )
-                        
-                        response = {
-                            "jsonrpc": "2.0",
-                            "id": task_id,
-                            "result": {
-                                "taskId": params.get("taskId"),
+
+                        payload = _RESULT_TEMPLATE % (task_id_json, _dumps({
+                            "taskId": params.get("taskId"),
+                            "status": "completed",
+                            "output": result
+                        }))
+                    else:
+                        payload = _ERROR_TEMPLATE % (task_id_json, _ERR_NO_HANDLER)
+                elif jsonrpc_method == "a2a/tasks":
+                    # Batch: dispatch the inner task list in one request.
+                    params = request.get("params", {})
+                    sender = params.get("sender")
+
+                    if task_handler:
+                        outputs = [
+                            {
+                                "taskId": task.get("taskId"),
                                 "status": "completed",
-                                "output": result
+                                "output": task_handler(
+                                    action=task.get("action"),
+                                    input_data=task.get("input", {}),
+                                    sender=sender
+                                )
                             }
-                        }
+                            for task in params.get("tasks", [])[:_MAX_BATCH]
+                        ]
+                        payload = _RESULT_TEMPLATE % (task_id_json, _dumps(outputs))
                     else:
-                        response = {
-                            "jsonrpc": "2.0",
-                            "id": task_id,
-                            "error": {
-                                "code": -32001,
-                                "message": "No handler registered"
-                            }
-                        }
+                        payload = _ERROR_TEMPLATE % (task_id_json, _ERR_NO_HANDLER)
                 else:
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": task_id,
-                        "error": {
-                            "code": -32601,
-                            "message": "Method not found"
-                        }
-                    }
-                
-                self.send_response(200)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(json.dumps(response).encode())
+                    payload = _ERROR_TEMPLATE % (task_id_json, _ERR_METHOD_NOT_FOUND)
+
+                self._send_payload(200, payload)
             
             def log_message(self, format, *args):
                 pass  # Suppress logging
 
-        server = HTTPServer(("0.0.0.0", self.port), Handler)
+        server = A2AHTTPServer(("0.0.0.0", self.port), Handler)
         print(f"🤖 Agent '{self.agent_id}' running on port {self.port}")
-        
+
         try:
             server.serve_forever()
         except KeyboardInterrupt:
             server.shutdown()
 
+    def run_async(self):
+        """Run the agent server on an asyncio event loop.
+
+        Serves the same JSON-RPC protocol as run(), but all in-flight
+        tasks share one event loop instead of one thread per
+        connection, so an I/O-bound agent can hold thousands of open
+        tasks. Handlers registered as `async def` are awaited directly;
+        sync handlers are dispatched to the default executor so they
+        don't block the loop.
+        """
+        try:
+            asyncio.run(self._serve_async())
+        except KeyboardInterrupt:
+            pass
+
+    async def _serve_async(self):
+        server = await asyncio.start_server(
+            self._handle_async_connection, "0.0.0.0", self.port
+        )
+        print(f"🤖 Agent '{self.agent_id}' running on port {self.port} (async)")
+        async with server:
+            await server.serve_forever()
+
+    async def _handle_async_connection(self, reader, writer):
+        """Serve JSON-RPC POSTs on one keep-alive connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if request_line.split(b" ", 1)[0] != b"POST":
+                    # Only JSON-RPC POSTs are served, matching the
+                    # threaded variant. Any pending body is never
+                    # drained, so the connection closes afterwards.
+                    payload = _dumps({"error": "Method not allowed"})
+                    status = b"405 Method Not Allowed"
+                    keep_alive = False
+                elif length < 0 or length > _MAX_BODY:
+                    # The oversized body is never drained, so the
+                    # connection closes after this response.
+                    payload = _dumps({"error": "Request body too large"})
+                    status = b"413 Payload Too Large"
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b"{}"
+                    payload = await self._dispatch_async(body)
+                    status = b"200 OK"
+                    keep_alive = True
+
+                writer.write(
+                    b"HTTP/1.1 " + status +
+                    (b"" if keep_alive else b"\r\nConnection: close") +
+                    b"\r\nContent-Type: application/json"
+                    b"\r\nContent-Length: " + str(len(payload)).encode() +
+                    b"\r\n\r\n" + payload
+                )
+                await writer.drain()
+                if not keep_alive or headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    async def _dispatch_async(self, body: bytes) -> bytes:
+        """Dispatch one JSON-RPC request body and return response bytes."""
+        try:
+            request = _loads(body)
+        except ValueError:
+            return _ERROR_TEMPLATE % (b"null", _dumps(
+                {"code": -32700, "message": "Parse error"}
+            ))
+
+        task_id_json = _dumps(request.get("id"))
+        method = request.get("method", "")
+
+        if method not in ("a2a/task", "a2a/tasks"):
+            return _ERROR_TEMPLATE % (task_id_json, _ERR_METHOD_NOT_FOUND)
+        if not self._task_handler:
+            return _ERROR_TEMPLATE % (task_id_json, _ERR_NO_HANDLER)
+
+        params = request.get("params", {})
+        sender = params.get("sender")
+
+        if method == "a2a/tasks":
+            outputs = []
+            for task in params.get("tasks", [])[:_MAX_BATCH]:
+                outputs.append({
+                    "taskId": task.get("taskId"),
+                    "status": "completed",
+                    "output": await self._call_handler(
+                        task.get("action"), task.get("input", {}), sender
+                    )
+                })
+            return _RESULT_TEMPLATE % (task_id_json, _dumps(outputs))
+
+        result = await self._call_handler(
+            params.get("action"), params.get("input", {}), sender
+        )
+        return _RESULT_TEMPLATE % (task_id_json, _dumps({
+            "taskId": params.get("taskId"),
+            "status": "completed",
+            "output": result
+        }))
+
+    async def _call_handler(self, action, input_data, sender):
+        """Invoke the task handler, off-loop if it is synchronous."""
+        kwargs = {"action": action, "input_data": input_data, "sender": sender}
+        if asyncio.iscoroutinefunction(self._task_handler):
+            return await self._task_handler(**kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: self._task_handler(**kwargs)
+        )
+
 
 if __name__ == "__main__":
     print("📦 A2A Python SDK loaded")
@@ -20,7 +20,7 @@ def research_agent_server():
     agent = A2AServer(
         agent_id="research-agent",
         name="Research Agent",
-        "search", " capabilities=["research",analyze"],
+        capabilities=["research", "search", "analyze"],
         port=9001
     )
 
@@ -8,8 +8,11 @@ import json
 import sys
 import os
 
-# Add parent to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Make the SDK importable when running straight from a checkout; with
+# `pip install -e .` the normal importer finds it and this is a no-op.
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
 
 from a2a_sdk import A2AServer
 
@@ -4,77 +4,104 @@ Demo: Task Requester Agent
 Discovers and sends tasks to other agents.
 """
 
+import asyncio
+import itertools
 import sys
 import os
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Make the SDK importable when running straight from a checkout; with
+# `pip install -e .` the normal importer finds it and this is a no-op.
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
 
-from a2a_sdk import A2AAgent
+# Capability queries as module-level tuples: the SDK interns these and
+# reuses their pre-serialized discover bodies across calls.
+_ECHO = ("echo",)
+_TRANSFORM = ("transform",)
 
 
-def demo():
+async def demo():
     """Run a demo of discovering and sending tasks."""
-    
-    # Create our agent
-    agent = A2AAgent(
+    # Imported here, not at module top, so merely importing this module
+    # (tests, tooling) doesn't pay for loading the SDK. A2A agents do no
+    # network or session setup in __init__ either; connections are
+    # dialed lazily on the first call.
+    from a2a_sdk import AsyncA2AAgent
+
+    # Create our agent; closing it at the end releases the pooled
+    # keep-alive connections.
+    agent = AsyncA2AAgent(
         agent_id="requester-demo",
         name="Requester Demo",
         capabilities=["request", "delegate"],
         directory_url="http://localhost:8080"
     )
-    
+
     # Register (we don't need a server for this demo)
     # Just use the directory for discovery
-    
-    print("\n🔍 Discovering agents with 'echo' capability...")
-    echo_agent = agent.discover(["echo"])
-    
-    if echo_agent:
-        print(f"   Found: {echo_agent['name']} ({echo_agent['agentId']})")
-        
-        print("\n📤 Sending 'echo' task...")
-        result = agent.send_task(
-            target_agent_id=echo_agent["agentId"],
-            action="echo",
-            input_data={"message": "Hello from A2A!"}
-        )
-        print(f"   Result: {result}")
-        
-        print("\n📤 Sending 'uppercase' task...")
-        result = agent.send_task(
-            target_agent_id=echo_agent["agentId"],
-            action="uppercase",
-            input_data={"text": "hello a2a"}
-        )
-        print(f"   Result: {result}")
-        
-        print("\n📤 Sending 'ping' task...")
-        result = agent.send_task(
-            target_agent_id=echo_agent["agentId"],
-            action="ping",
-            input_data={}
-        )
-        print(f"   Result: {result}")
-        
-    else:
-        print("   No echo agent found!")
-    
-    print("\n🔍 Discovering agents with 'transform' capability...")
-    transform_agent = agent.discover(["transform"])
-    
-    if transform_agent:
-        print(f"   Found: {transform_agent['name']}")
-        
-        print("\n📤 Sending 'reverse' task...")
-        result = agent.send_task(
-            target_agent_id=transform_agent["agentId"],
-            action="reverse",
-            input_data={"text": "a2a is working"}
-        )
-        print(f"   Result: {result}")
-    else:
-        print("   No transform agent found!")
+
+    try:
+        await _run_demo(agent)
+    finally:
+        await agent.close()
+
+
+async def _run_demo(agent):
+    # We know every capability the demo needs up front, so warm them in
+    # one concurrent round instead of discovering lazily between sends.
+    sys.stdout.write("\n🔍 Prefetching agents for 'echo' and 'transform' capabilities...\n")
+    prefetched = await agent.discover_many([_ECHO, _TRANSFORM])
+    echo_agent = prefetched.get(_ECHO)
+    transform_agent = prefetched.get(_TRANSFORM)
+
+    # The echo and transform branches don't depend on each other, so
+    # their round trips run concurrently; each branch returns its output
+    # lines so the report stays in order and flushes as a single write
+    # instead of one syscall (and stdout lock) per print.
+    lines = itertools.chain(*await asyncio.gather(
+        _echo_branch(agent, echo_agent),
+        _transform_branch(agent, transform_agent),
+    ))
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+async def _echo_branch(agent, echo_agent):
+    if not echo_agent:
+        return ["   No echo agent found!"]
+
+    lines = [f"   Found: {echo_agent['name']} ({echo_agent['agentId']})"]
+
+    # One batched round trip instead of three sequential requests
+    lines.append("\n📤 Sending 'echo', 'uppercase' and 'ping' tasks as one batch...")
+    results = await agent.send_tasks(echo_agent["agentId"], [
+        {"action": "echo", "input_data": {"message": "Hello from A2A!"}},
+        {"action": "uppercase", "input_data": {"text": "hello a2a"}},
+        {"action": "ping", "input_data": {}},
+    ])
+    lines.extend(
+        f"   {action}: {result}"
+        for action, result in zip(["echo", "uppercase", "ping"], results)
+    )
+    return lines
+
+
+async def _transform_branch(agent, transform_agent):
+    if not transform_agent:
+        return ["\n   No transform agent found!"]
+
+    lines = [f"\n   Found: {transform_agent['name']}"]
+
+    # Bind once: the returned closure captures the resolved endpoint,
+    # so repeated sends to this agent skip the per-call lookups.
+    send = await agent.bind_sender(transform_agent["agentId"])
+
+    lines.append("\n📤 Sending 'reverse' task...")
+    result = await send("reverse", {"text": "a2a is working"})
+    lines.append(f"   Result: {result}")
+    return lines
 
 
 if __name__ == "__main__":
-    demo()
+    asyncio.run(demo())